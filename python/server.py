@@ -2,6 +2,12 @@
 """
 xCOMET Persistent Server
 Keeps the model loaded in memory for fast inference.
+
+CPU thread tuning:
+    XCOMET_TORCH_THREADS    Intra-op threads (default: CPUs available to this process,
+                            divided by XCOMET_WORKERS)
+    XCOMET_INTEROP_THREADS  Inter-op threads (default: a quarter of that, at least 1)
+OMP_NUM_THREADS and MKL_NUM_THREADS default to the intra-op count unless already set.
 """
 
 import os
@@ -11,22 +17,50 @@ import signal
 import time
 import asyncio
 import warnings
+import hashlib
+import operator
 import threading
+from collections import OrderedDict
 from typing import Optional, List
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+# Size thread pools to the CPUs we may actually run on (container limits, taskset),
+# split evenly between worker processes when XCOMET_WORKERS > 1
+_cpu_count = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+_workers = max(1, int(os.environ.get("XCOMET_WORKERS", "1")))
+_worker_cpus = max(1, _cpu_count // _workers)
+_torch_threads = int(os.environ.get("XCOMET_TORCH_THREADS", _worker_cpus))
+_interop_threads = int(os.environ.get("XCOMET_INTEROP_THREADS", max(1, _worker_cpus // 4)))
+os.environ.setdefault("OMP_NUM_THREADS", str(_torch_threads))
+os.environ.setdefault("MKL_NUM_THREADS", str(_torch_threads))
+
+# Persist torch.compile (Inductor) artifacts across restarts (used with XCOMET_COMPILE)
+os.environ.setdefault(
+    "TORCHINDUCTOR_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "xcomet", "inductor"),
+)
+os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
 import uvicorn
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard json module
+    orjson = None
+
 # Global model instance
 _model = None
 _model_name = None
 _model_lock = threading.Lock()
+_model_emits_spans = False  # Whether prediction metadata may carry error_spans (set at load)
 
 # Statistics
 _stats = {
@@ -37,8 +71,47 @@ _stats = {
     "batch_api_count": 0,          # /batch_evaluate endpoint calls
     "total_pairs_evaluated": 0,    # Total pairs evaluated (including internal calls)
     "total_inference_time_ms": 0,
+    "cache_hits": 0,               # Pairs answered from the score cache
+    "cache_misses": 0,             # Pairs that needed model inference
 }
 
+# Score cache: (source, translation, reference, model) -> {"score", "errors"}
+_score_cache: "OrderedDict[bytes, dict]" = OrderedDict()
+_score_cache_size = int(os.environ.get("XCOMET_CACHE_SIZE", "10000"))
+
+# Tokenizer cache: text -> unpadded encoder inputs, shared by src/mt/ref
+_token_cache: "OrderedDict[bytes, dict]" = OrderedDict()
+_token_cache_size = int(os.environ.get("XCOMET_TOK_CACHE_SIZE", "50000"))
+_token_cache_lock = threading.Lock()
+
+# Inference precision: fp32 (default), bf16 or fp16 autocast
+_precision = os.environ.get("XCOMET_PRECISION", "fp32").lower()
+
+# Request coalescing: single-pair requests queued within XCOMET_BATCH_MS are
+# scored together in one model.predict call (up to XCOMET_MAX_BATCH pairs)
+_batch_queue: Optional[asyncio.Queue] = None
+_max_batch = int(os.environ.get("XCOMET_MAX_BATCH", "8"))
+_batch_wait_ms = int(os.environ.get("XCOMET_BATCH_MS", "10"))
+
+# Serializes model.predict calls running in worker threads
+_inference_semaphore: Optional[asyncio.Semaphore] = None
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson when it is installed."""
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _ndjson_line(obj) -> bytes:
+    """Serialize one NDJSON line."""
+    if orjson is None:
+        return (json.dumps(obj) + "\n").encode("utf-8")
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+
 
 class EvaluateRequest(BaseModel):
     source: str
@@ -69,7 +142,7 @@ class DetectErrorsRequest(BaseModel):
 
 def get_model():
     """Lazy load the model on first request. Thread-safe with lock."""
-    global _model, _model_name, _stats
+    global _model, _model_name, _model_emits_spans, _stats
 
     # Fast path: model already loaded (no lock needed)
     if _model is not None:
@@ -85,9 +158,34 @@ def get_model():
         print(f"[xcomet-server] Loading model: {model_name}", file=sys.stderr)
 
         load_start = time.time()
+        _configure_torch_threads()
         from comet import download_model, load_from_checkpoint
         model_path = download_model(model_name)
-        _model = load_from_checkpoint(model_path)
+        _prefetch_checkpoint(model_path)
+        model = load_from_checkpoint(model_path)
+        model.eval()
+
+        # Optional dynamic int8 quantization for CPU inference
+        if os.environ.get("XCOMET_QUANTIZE", "").lower() == "int8":
+            model = _quantize_model(model)
+
+        with _token_cache_lock:
+            _token_cache.clear()
+        _install_token_cache(model)
+
+        # Optional torch.compile (opt-in, first compilation is slow)
+        if os.environ.get("XCOMET_COMPILE", "").lower() in ("true", "1", "yes"):
+            _compile_model(model)
+
+        # Let fp32 matmuls outside autocast use TF32 tensor cores
+        if _precision in ("bf16", "fp16"):
+            import torch
+            if torch.cuda.is_available():
+                torch.backends.cuda.matmul.allow_tf32 = True
+                torch.set_float32_matmul_precision("high")
+
+        _model_emits_spans = _warmup(model, model_name)
+        _model = model
         _model_name = model_name
         _stats["model_load_time"] = round((time.time() - load_start) * 1000)
 
@@ -96,6 +194,324 @@ def get_model():
     return _model
 
 
+def _configure_torch_threads():
+    """Apply XCOMET_TORCH_THREADS / XCOMET_INTEROP_THREADS to torch before the model loads."""
+    import torch
+
+    torch.set_num_threads(_torch_threads)
+    try:
+        torch.set_num_interop_threads(_interop_threads)
+    except RuntimeError:
+        # Can only be set before any inter-op parallel work has started
+        pass
+
+
+def _preload_model():
+    """Load the model ahead of the first request, logging failures instead of raising."""
+    try:
+        get_model()
+    except Exception as e:
+        print(f"[xcomet-server] Preloading model failed: {e}", file=sys.stderr)
+
+
+def _prefetch_checkpoint(path: str):
+    """Ask the kernel to start reading the checkpoint into the page cache."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def _install_token_cache(model):
+    """
+    Wrap the encoder's prepare_sample so each distinct text is tokenized only once.
+    Cached rows are stored without padding and re-padded per batch by the tokenizer.
+    Only plain calls (src/ref for XCOMET) are cached; calls with extra arguments, such as
+    XCOMET's word-level mt tokenization, go straight to the encoder. The cache lives in
+    this process, so predict must collate in-process (num_workers=0).
+    """
+    encoder = getattr(model, "encoder", None)
+    tokenizer = getattr(encoder, "tokenizer", None)
+    if (
+        _token_cache_size <= 0
+        or tokenizer is None
+        or not hasattr(encoder, "prepare_sample")
+        or getattr(tokenizer, "padding_side", "right") != "right"
+    ):
+        return
+
+    prepare_sample = encoder.prepare_sample
+
+    def cached_prepare_sample(sample, *args, **kwargs):
+        if args or kwargs or not all(isinstance(text, str) for text in sample):
+            return prepare_sample(sample, *args, **kwargs)
+
+        keys = [hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest() for text in sample]
+        with _token_cache_lock:
+            rows = {}
+            for key in keys:
+                row = _token_cache.get(key)
+                if row is not None:
+                    _token_cache.move_to_end(key)
+                    rows[key] = row
+
+        missing = {key: text for key, text in zip(keys, sample) if key not in rows}
+        if missing:
+            output = prepare_sample(list(missing.values()))
+            if "attention_mask" not in output:
+                return prepare_sample(sample)
+            lengths = output["attention_mask"].sum(1).tolist()
+            for j, key in enumerate(missing):
+                rows[key] = {name: values[j, :lengths[j]].tolist() for name, values in output.items()}
+
+            with _token_cache_lock:
+                for key in missing:
+                    _token_cache[key] = rows[key]
+                while len(_token_cache) > _token_cache_size:
+                    _token_cache.popitem(last=False)
+
+        return tokenizer.pad([rows[key] for key in keys], padding=True, return_tensors="pt")
+
+    encoder.prepare_sample = cached_prepare_sample
+
+
+def _quantize_model(model):
+    """Quantize Linear layers to int8 with dynamic quantization. CPU inference only."""
+    import torch
+
+    if torch.cuda.is_available():
+        print(
+            "[xcomet-server] XCOMET_QUANTIZE=int8 only applies to CPU hosts; skipping "
+            "(use XCOMET_PRECISION=bf16 on GPU)",
+            file=sys.stderr,
+        )
+        return model
+
+    print("[xcomet-server] Quantizing model to int8 (XCOMET_QUANTIZE=int8)...", file=sys.stderr)
+    # In place, so the fp32 weights are not held twice during conversion
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
+def _compile_model(model):
+    """Compile the model forward pass with torch.compile (traced on the warm-up prediction)."""
+    import torch
+
+    print("[xcomet-server] Compiling model (XCOMET_COMPILE=true)...", file=sys.stderr)
+
+    # predict() goes through the Lightning trainer, which calls the module itself,
+    # so replacing the instance forward is enough to route inference through Inductor.
+    model.forward = torch.compile(model.forward, mode="reduce-overhead", dynamic=True)
+
+
+def _warmup(model, model_name: str) -> bool:
+    """
+    Run one dummy prediction so compilation and lazy initialization happen at load time.
+    Returns whether the model emits error spans in its prediction metadata; if the
+    warm-up fails it is logged and span support is treated as unknown (True).
+    """
+    import torch
+
+    # Warm up on CPU: requests default to use_gpu=false, and a GPU predict here could
+    # fail to fit the model in VRAM and block a load that CPU requests would be fine with
+    warmup_start = time.time()
+    data = [{"src": "Hello world.", "mt": "Hello world."}]
+    if model_requires_reference(model_name):
+        data[0]["ref"] = "Hello world."
+    try:
+        with torch.inference_mode(), _autocast(0):
+            output = model.predict(data, batch_size=1, gpus=0, num_workers=0, length_batching=False)
+    except Exception as e:
+        print(f"[xcomet-server] Warm-up prediction failed: {e}", file=sys.stderr)
+        return True
+
+    print(
+        f"[xcomet-server] Warm-up prediction took {round((time.time() - warmup_start) * 1000)}ms",
+        file=sys.stderr,
+    )
+    metadata = getattr(output, "metadata", None)
+    return metadata is not None and "error_spans" in metadata
+
+
+def _length_order(data: List[dict]) -> List[int]:
+    """
+    Return the indices of data sorted by total character length of src, mt and ref.
+    Character length is a cheap proxy for token length.
+    """
+    lengths = [len(d["src"]) + len(d["mt"]) + len(d.get("ref", "")) for d in data]
+    return sorted(range(len(data)), key=lengths.__getitem__)
+
+
+def _cache_key(source: str, translation: str, reference: Optional[str], model_name: str) -> bytes:
+    """Build a fixed-size cache key for a translation pair scored by a given model."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (source, translation, reference or "", model_name):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.digest()
+
+
+def _cache_get(key: bytes) -> Optional[dict]:
+    """Look up a cached result and update hit/miss statistics."""
+    entry = _score_cache.get(key)
+    if entry is None:
+        _stats["cache_misses"] += 1
+        return None
+    _score_cache.move_to_end(key)
+    _stats["cache_hits"] += 1
+    return entry
+
+
+def _cache_put(key: bytes, entry: dict):
+    """Store a result, evicting the least recently used entries beyond XCOMET_CACHE_SIZE."""
+    if _score_cache_size <= 0:
+        return
+    _score_cache[key] = entry
+    _score_cache.move_to_end(key)
+    while len(_score_cache) > _score_cache_size:
+        _score_cache.popitem(last=False)
+
+
+_span_fields = operator.itemgetter("text", "start", "end", "severity")
+
+
+def _error_spans_per_item(metadata, count: int) -> list:
+    """
+    Split COMET prediction metadata into one error span list (or None) per item.
+    COMET returns metadata as a dict of per-field lists (src_scores, mqm_scores,
+    error_spans, ...), not as one entry per item.
+    """
+    spans = list(metadata.get("error_spans") or []) if metadata is not None else []
+    spans.extend([None] * (count - len(spans)))
+    return spans
+
+
+def _extract_errors(spans) -> list:
+    """Convert a single prediction's error spans into response dicts."""
+    if not spans:
+        return []
+
+    # Fast path: spans normally carry all four fields
+    try:
+        return [
+            {"text": text, "start": start, "end": end, "severity": severity}
+            for text, start, end, severity in map(_span_fields, spans)
+        ]
+    except KeyError:
+        pass
+
+    return [
+        {
+            "text": span.get("text", ""),
+            "start": span.get("start", 0),
+            "end": span.get("end", 0),
+            "severity": span.get("severity", "minor")
+        }
+        for span in spans
+    ]
+
+
+def _autocast(gpus: int):
+    """Return an autocast context for XCOMET_PRECISION, or a no-op context for fp32."""
+    if _precision not in ("bf16", "fp16"):
+        return nullcontext()
+
+    import torch
+    device_type = "cuda" if gpus else "cpu"
+    dtype = torch.bfloat16 if _precision == "bf16" else torch.float16
+    if device_type == "cuda" and dtype == torch.bfloat16 and not torch.cuda.is_bf16_supported():
+        dtype = torch.float16
+    return torch.autocast(device_type=device_type, dtype=dtype)
+
+
+def _predict(data: List[dict], batch_size: int, gpus: int):
+    """
+    Run model.predict on data in the given order.
+    Returns (scores as Python floats, error spans, inference_time_ms) with one error span
+    list (or None) per item.
+    """
+    import torch
+
+    model = get_model()
+    inference_start = time.time()
+    with torch.inference_mode(), _autocast(gpus):
+        output = model.predict(
+            data,
+            batch_size=batch_size,
+            gpus=gpus,
+            num_workers=0,  # Collate in-process so the tokenizer cache persists across calls
+            length_batching=False,  # Callers order data themselves
+        )
+    inference_time = round((time.time() - inference_start) * 1000)
+
+    # Convert scores to Python floats in one call rather than per element
+    scores = output.scores
+    scores = scores.tolist() if hasattr(scores, "tolist") else list(map(float, scores))
+
+    if _model_emits_spans:
+        # Also reached when the warm-up probe failed, so metadata may lack error_spans
+        spans = _error_spans_per_item(getattr(output, "metadata", None), len(data))
+    else:
+        spans = [None] * len(data)
+    return scores, spans, inference_time
+
+
+async def _predict_async(data: List[dict], batch_size: int, gpus: int):
+    """
+    Run _predict in a worker thread so the event loop keeps serving other endpoints.
+    Only one inference runs at a time; concurrent callers wait their turn.
+    """
+    global _inference_semaphore
+    if _inference_semaphore is None:
+        _inference_semaphore = asyncio.Semaphore(1)
+
+    async with _inference_semaphore:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, _predict, data, batch_size, gpus
+        )
+
+
+async def _batch_worker(queue: asyncio.Queue):
+    """Collect queued single-pair requests and score them in batches."""
+    loop = asyncio.get_running_loop()
+    while True:
+        items = [await queue.get()]
+        deadline = loop.time() + _batch_wait_ms / 1000
+        while len(items) < _max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # Requests for different devices cannot share a predict call
+        for gpus in sorted({item_gpus for _, item_gpus, _ in items}):
+            group = [item for item in items if item[1] == gpus]
+            data = [item_data for item_data, _, _ in group]
+            try:
+                scores, spans, inference_time = await _predict_async(data, len(data), gpus)
+            except Exception as e:
+                for _, _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            # Split the batch time across its requests so /stats totals stay accurate
+            share, remainder = divmod(inference_time, len(group))
+            for pos, (_, _, future) in enumerate(group):
+                if not future.done():
+                    future.set_result((scores[pos], spans[pos], share + (pos < remainder)))
+
+
 def model_requires_reference(model_name: str) -> bool:
     """Check if the model requires a reference translation."""
     ref_required = ["wmt22-comet-da", "wmt21-comet-da", "wmt20-comet-da"]
@@ -105,20 +521,30 @@ def model_requires_reference(model_name: str) -> bool:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown."""
-    global _stats
+    global _stats, _batch_queue, _inference_semaphore
     _stats["start_time"] = time.time()
     print(f"[xcomet-server] Starting on port {os.environ.get('PORT', 'unknown')}", file=sys.stderr)
 
-    # Eager loading if XCOMET_PRELOAD is set
-    if os.environ.get("XCOMET_PRELOAD", "").lower() in ("true", "1", "yes"):
-        print("[xcomet-server] Preloading model (XCOMET_PRELOAD=true)...", file=sys.stderr)
-        get_model()
+    # Eager loading unless XCOMET_PRELOAD=false. The model loads in a background
+    # thread so the server can answer /health meanwhile; requests that need the
+    # model wait for the load in progress instead of starting another one.
+    if os.environ.get("XCOMET_PRELOAD", "true").lower() not in ("false", "0", "no"):
+        print("[xcomet-server] Preloading model in background...", file=sys.stderr)
+        asyncio.get_running_loop().run_in_executor(None, _preload_model)
+
+    # Start the request coalescing worker
+    _inference_semaphore = asyncio.Semaphore(1)
+    _batch_queue = asyncio.Queue()
+    batch_worker = asyncio.create_task(_batch_worker(_batch_queue))
 
     yield
     print("[xcomet-server] Shutting down...", file=sys.stderr)
 
+    batch_worker.cancel()
+    _batch_queue = None
 
-app = FastAPI(title="xCOMET Server", lifespan=lifespan)
+
+app = FastAPI(title="xCOMET Server", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 
 @app.get("/health")
@@ -160,49 +586,141 @@ async def stats():
         "total_pairs_evaluated": _stats["total_pairs_evaluated"],
         "total_inference_time_ms": _stats["total_inference_time_ms"],
         "avg_inference_time_ms": avg_inference_time_ms,
+        "cache_hits": _stats["cache_hits"],
+        "cache_misses": _stats["cache_misses"],
+        "cache_size": len(_score_cache),
     }
 
 
-def _evaluate_internal(source: str, translation: str, reference: Optional[str], use_gpu: bool):
+async def _parse_batch_request(http_request: Request) -> BatchEvaluateRequest:
     """
-    Internal evaluation function. Does NOT update API call statistics.
-    Returns (result_dict, inference_time_ms).
+    Validate a batch request body straight from the raw JSON bytes with pydantic-core,
+    skipping FastAPI's json.loads + validate-from-dict path on large batches.
+    Invalid bodies get the same 422 response FastAPI would produce.
     """
-    model = get_model()
-    model_name = os.environ.get("XCOMET_MODEL", "Unbabel/XCOMET-XL")
+    try:
+        return BatchEvaluateRequest.model_validate_json(await http_request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+
+
+# The batch routes read the raw body themselves, so FastAPI can't infer their request
+# schema; document it explicitly and register the nested models as components.
+_batch_request_schema = BatchEvaluateRequest.model_json_schema(ref_template="#/components/schemas/{model}")
+_batch_request_defs = _batch_request_schema.pop("$defs", {})
+_batch_openapi_extra = {
+    "requestBody": {
+        "content": {"application/json": {"schema": _batch_request_schema}},
+        "required": True,
+    }
+}
+_default_openapi = app.openapi
+
+
+def _openapi() -> dict:
+    if app.openapi_schema is None:
+        schema = _default_openapi()
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(_batch_request_defs)
+    return app.openapi_schema
+
+
+app.openapi = _openapi
+
+
+def _check_batch_references(pairs: List[TranslationPair], model_name: str):
+    """Raise a 400 error if the model requires references and some pairs lack one."""
+    if model_requires_reference(model_name):
+        missing_ref_count = sum(1 for p in pairs if not p.reference)
+        if missing_ref_count > 0:
+            raise HTTPException(
+                status_code=400,
+                detail=f'Model "{model_name}" requires reference translations. {missing_ref_count} pairs are missing reference.'
+            )
+
+
+async def _score_pairs(pairs: List[TranslationPair], batch_size: int, use_gpu: bool, model_name: str):
+    """
+    Score pairs, serving repeated pairs from the cache and sending only misses to the model.
+    A single miss goes through the coalescing queue so it can share a batch with other requests.
+    Does NOT update API call statistics.
+    Returns ({"score", "errors"} per pair in input order, inference_time_ms).
+    """
+    keys = [_cache_key(p.source, p.translation, p.reference, model_name) for p in pairs]
+    entries = [_cache_get(key) for key in keys]
+    miss_indices = [i for i, entry in enumerate(entries) if entry is None]
+    if not miss_indices:
+        return entries, 0
+
+    # Build data list
+    data = []
+    for i in miss_indices:
+        pair = pairs[i]
+        item = {"src": pair.source, "mt": pair.translation}
+        if pair.reference:
+            item["ref"] = pair.reference
+        data.append(item)
+
+    gpus = 1 if use_gpu else 0
+    if len(data) == 1 and _batch_queue is not None:
+        future = asyncio.get_running_loop().create_future()
+        await _batch_queue.put((data[0], gpus, future))
+        score, item_spans, inference_time = await future
+        order, scores, spans = [0], [score], [item_spans]
+    else:
+        # Sort by length so each minibatch is padded to similar lengths;
+        # results are scattered back to their original positions below.
+        order = _length_order(data)
+        sorted_data = [data[j] for j in order]
+        scores, spans, inference_time = await _predict_async(sorted_data, batch_size, gpus)
+
+    for pos, j in enumerate(order):
+        i = miss_indices[j]
+        entries[i] = {"score": scores[pos], "errors": _extract_errors(spans[pos])}
+        _cache_put(keys[i], entries[i])
+
+    return entries, inference_time
+
+
+def _batch_result(index: int, entry: dict) -> dict:
+    """Build a per-pair result row for batch responses."""
+    errors = list(entry["errors"])
+    return {
+        "index": index,
+        "score": entry["score"],
+        "errors": errors,
+        "error_count": len(errors),
+        "has_critical_errors": any(e["severity"] == "critical" for e in errors)
+    }
+
 
-    # Validate reference requirement
+def _batch_summary(total_pairs: int, average_score: float, good_count: int, critical_count: int) -> str:
+    """Build the human-readable summary line for batch responses."""
+    return f"Evaluated {total_pairs} pairs. Average score: {average_score:.3f}. {good_count} good quality, {critical_count} with critical errors."
+
+
+def _check_reference(reference: Optional[str], model_name: str):
+    """Raise ValueError if the model requires a reference and none was given."""
     if not reference and model_requires_reference(model_name):
         raise ValueError(f'Model "{model_name}" requires a reference translation.')
 
-    data = [{
-        "src": source,
-        "mt": translation,
-    }]
-    if reference:
-        data[0]["ref"] = reference
 
-    gpus = 1 if use_gpu else 0
-    inference_start = time.time()
-    output = model.predict(data, batch_size=1, gpus=gpus, num_workers=1)
-    inference_time = round((time.time() - inference_start) * 1000)
+async def _score_single(source: str, translation: str, reference: Optional[str], use_gpu: bool):
+    """
+    Validate and score a single pair. Does NOT update API call statistics.
+    Returns ({"score", "errors"}, inference_time_ms).
+    """
+    model_name = os.environ.get("XCOMET_MODEL", "Unbabel/XCOMET-XL")
+    _check_reference(reference, model_name)
+
+    pair = TranslationPair.model_construct(source=source, translation=translation, reference=reference)
+    entries, inference_time = await _score_pairs([pair], 1, use_gpu, model_name)
+    return entries[0], inference_time
+
 
-    score = float(output.scores[0])
-    errors = []
-
-    # Extract error spans if available
-    if hasattr(output, 'metadata') and output.metadata:
-        metadata = output.metadata[0]
-        if metadata and 'error_spans' in metadata:
-            for span in metadata['error_spans']:
-                errors.append({
-                    "text": span.get("text", ""),
-                    "start": span.get("start", 0),
-                    "end": span.get("end", 0),
-                    "severity": span.get("severity", "minor")
-                })
-
-    # Generate summary
+def _quality_summary(score: float, error_count: int) -> str:
+    """Build the human-readable summary for a single evaluation."""
     if score >= 0.9:
         quality = "Excellent"
     elif score >= 0.7:
@@ -211,14 +729,7 @@ def _evaluate_internal(source: str, translation: str, reference: Optional[str],
         quality = "Fair"
     else:
         quality = "Poor"
-
-    result = {
-        "score": score,
-        "errors": errors,
-        "summary": f"{quality} quality (score: {score:.3f}) with {len(errors)} error(s) detected."
-    }
-
-    return result, inference_time
+    return f"{quality} quality (score: {score:.3f}) with {error_count} error(s) detected."
 
 
 @app.post("/evaluate")
@@ -226,16 +737,21 @@ async def evaluate(request: EvaluateRequest):
     """Evaluate a single translation."""
     global _stats
     try:
-        result, inference_time = _evaluate_internal(
+        entry, inference_time = await _score_single(
             request.source, request.translation, request.reference, request.use_gpu
         )
+        errors = list(entry["errors"])
 
         # Update stats (only for direct API calls)
         _stats["evaluate_api_count"] += 1
         _stats["total_pairs_evaluated"] += 1
         _stats["total_inference_time_ms"] += inference_time
 
-        return result
+        return {
+            "score": entry["score"],
+            "errors": errors,
+            "summary": _quality_summary(entry["score"], len(errors))
+        }
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -250,8 +766,8 @@ async def detect_errors(request: DetectErrorsRequest):
     """Detect errors in a translation."""
     global _stats
     try:
-        # Get evaluation result using internal function (no double counting)
-        eval_result, inference_time = _evaluate_internal(
+        # Score using the shared helper (no double counting)
+        entry, inference_time = await _score_single(
             request.source, request.translation, request.reference, request.use_gpu
         )
 
@@ -265,7 +781,7 @@ async def detect_errors(request: DetectErrorsRequest):
         min_severity_order = severity_order.get(request.min_severity, 0)
 
         filtered_errors = [
-            e for e in eval_result["errors"]
+            e for e in entry["errors"]
             if severity_order.get(e["severity"], 0) >= min_severity_order
         ]
 
@@ -288,10 +804,11 @@ async def detect_errors(request: DetectErrorsRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/batch_evaluate")
-async def batch_evaluate(request: BatchEvaluateRequest):
-    """Evaluate multiple translations in a batch."""
+@app.post("/batch_evaluate", openapi_extra=_batch_openapi_extra)
+async def batch_evaluate(http_request: Request):
+    """Evaluate multiple translations in a batch (body: BatchEvaluateRequest)."""
     global _stats
+    request = await _parse_batch_request(http_request)
     try:
         if not request.pairs:
             return {
@@ -301,76 +818,40 @@ async def batch_evaluate(request: BatchEvaluateRequest):
                 "summary": "No pairs to evaluate."
             }
 
-        model = get_model()
         model_name = os.environ.get("XCOMET_MODEL", "Unbabel/XCOMET-XL")
 
         # Validate reference requirement
-        if model_requires_reference(model_name):
-            missing_ref_count = sum(1 for p in request.pairs if not p.reference)
-            if missing_ref_count > 0:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f'Model "{model_name}" requires reference translations. {missing_ref_count} pairs are missing reference.'
-                )
-
-        # Build data list
-        data = []
-        for pair in request.pairs:
-            item = {"src": pair.source, "mt": pair.translation}
-            if pair.reference:
-                item["ref"] = pair.reference
-            data.append(item)
+        _check_batch_references(request.pairs, model_name)
 
-        gpus = 1 if request.use_gpu else 0
-        inference_start = time.time()
-        output = model.predict(data, batch_size=request.batch_size, gpus=gpus, num_workers=1)
-        inference_time = round((time.time() - inference_start) * 1000)
+        entries, inference_time = await _score_pairs(
+            request.pairs, request.batch_size, request.use_gpu, model_name
+        )
 
         # Update stats
         _stats["batch_api_count"] += 1
         _stats["total_pairs_evaluated"] += len(request.pairs)
         _stats["total_inference_time_ms"] += inference_time
 
-        # Build results
+        # Build results and statistics in one pass
         results = []
-        for i, score in enumerate(output.scores):
-            result = {
-                "index": i,
-                "score": float(score),
-                "errors": [],
-                "error_count": 0,
-                "has_critical_errors": False
-            }
-
-            # Extract error spans if available
-            if hasattr(output, 'metadata') and output.metadata and i < len(output.metadata):
-                metadata = output.metadata[i]
-                if metadata and 'error_spans' in metadata:
-                    for span in metadata['error_spans']:
-                        result["errors"].append({
-                            "text": span.get("text", ""),
-                            "start": span.get("start", 0),
-                            "end": span.get("end", 0),
-                            "severity": span.get("severity", "minor")
-                        })
-                        if span.get("severity") == "critical":
-                            result["has_critical_errors"] = True
-                    result["error_count"] = len(result["errors"])
-
+        total_score = 0.0
+        good_count = 0
+        critical_count = 0
+        for i, entry in enumerate(entries):
+            result = _batch_result(i, entry)
+            total_score += result["score"]
+            good_count += result["score"] >= 0.7
+            critical_count += result["has_critical_errors"]
             results.append(result)
+        average_score = total_score / len(results)
 
-        # Calculate statistics
-        total_score = sum(r["score"] for r in results)
-        average_score = total_score / len(results) if results else 0
-        good_count = sum(1 for r in results if r["score"] >= 0.7)
-        critical_count = sum(1 for r in results if r["has_critical_errors"])
-
-        return {
+        # Returned as a response object so FastAPI skips jsonable_encoder on large batches
+        return ORJSONResponse({
             "average_score": average_score,
             "total_pairs": len(request.pairs),
             "results": results,
-            "summary": f"Evaluated {len(request.pairs)} pairs. Average score: {average_score:.3f}. {good_count} good quality, {critical_count} with critical errors."
-        }
+            "summary": _batch_summary(len(request.pairs), average_score, good_count, critical_count)
+        })
 
     except HTTPException:
         raise
@@ -378,6 +859,68 @@ async def batch_evaluate(request: BatchEvaluateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/batch_evaluate_stream", openapi_extra=_batch_openapi_extra)
+async def batch_evaluate_stream(http_request: Request):
+    """
+    Evaluate multiple translations and stream the results as NDJSON (body: BatchEvaluateRequest).
+    The first line is {"total_pairs": n}, followed by one result row per pair
+    (same shape as /batch_evaluate results) and a final line with
+    average_score and summary. Pairs are scored in chunks so rows are sent
+    as soon as their chunk is done.
+    If scoring fails after the response has started, the stream ends with a
+    single {"error": message} line instead of the summary line (the HTTP status
+    is already 200), so clients must check the last line for an error key.
+    """
+    global _stats
+    request = await _parse_batch_request(http_request)
+    model_name = os.environ.get("XCOMET_MODEL", "Unbabel/XCOMET-XL")
+
+    # Validate before the response starts, while an HTTP error can still be returned
+    if request.batch_size < 1:
+        raise HTTPException(status_code=400, detail="batch_size must be at least 1.")
+    _check_batch_references(request.pairs, model_name)
+
+    _stats["batch_api_count"] += 1
+    total_pairs = len(request.pairs)
+    chunk_size = request.batch_size * 8
+
+    async def rows():
+        yield _ndjson_line({"total_pairs": total_pairs})
+
+        total_score = 0.0
+        good_count = 0
+        critical_count = 0
+        for chunk_start in range(0, total_pairs, chunk_size):
+            chunk = request.pairs[chunk_start:chunk_start + chunk_size]
+            try:
+                entries, inference_time = await _score_pairs(
+                    chunk, request.batch_size, request.use_gpu, model_name
+                )
+            except Exception as e:
+                yield _ndjson_line({"error": str(e)})
+                return
+
+            _stats["total_pairs_evaluated"] += len(chunk)
+            _stats["total_inference_time_ms"] += inference_time
+
+            for offset, entry in enumerate(entries):
+                result = _batch_result(chunk_start + offset, entry)
+                total_score += result["score"]
+                good_count += result["score"] >= 0.7
+                critical_count += result["has_critical_errors"]
+                yield _ndjson_line(result)
+
+        if total_pairs:
+            average_score = total_score / total_pairs
+            summary = _batch_summary(total_pairs, average_score, good_count, critical_count)
+        else:
+            average_score = 0
+            summary = "No pairs to evaluate."
+        yield _ndjson_line({"average_score": average_score, "summary": summary})
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
 @app.post("/shutdown")
 async def shutdown():
     """Graceful shutdown endpoint."""
@@ -386,7 +929,8 @@ async def shutdown():
     # Schedule shutdown after a short delay to allow current request to complete
     async def delayed_shutdown():
         await asyncio.sleep(1)
-        os.kill(os.getpid(), signal.SIGTERM)
+        # With XCOMET_WORKERS > 1, stop the supervisor so it shuts down every worker
+        os.kill(int(os.environ.get("XCOMET_SUPERVISOR_PID", os.getpid())), signal.SIGTERM)
 
     asyncio.create_task(delayed_shutdown())
     return {"status": "shutting_down"}
@@ -397,23 +941,42 @@ if __name__ == "__main__":
 
     port = int(os.environ.get("PORT", "0"))
 
-    # Create socket first to get the actual port (avoids race condition)
+    # Create and start listening on the socket first to get the actual port (avoids race
+    # condition); connections that arrive before uvicorn is up wait in the backlog
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     sock.bind(("127.0.0.1", port))
+    sock.listen(2048)
     actual_port = sock.getsockname()[1]
 
     # Notify Node.js of the actual port before starting uvicorn
     print(json.dumps({"port": actual_port}), flush=True)
 
-    config = uvicorn.Config(
-        app,
+    options = dict(
         host="127.0.0.1",
         port=actual_port,
         log_level="warning",
         fd=sock.fileno(),  # Pass socket file descriptor
+        loop="auto",  # uvloop when installed (uvicorn[standard])
+        http="auto",  # httptools when installed (uvicorn[standard])
+        backlog=2048,
+        limit_concurrency=int(os.environ.get("XCOMET_MAX_CONCURRENCY", "256")),
+        timeout_keep_alive=30,
     )
-    server = uvicorn.Server(config)
 
-    # Run with the pre-bound socket
-    server.run(sockets=[sock])
+    if _workers > 1:
+        # Worker processes inherit the listening socket, so they all accept on the same
+        # port without rebinding. Each worker loads its own copy of the model and
+        # inherits the per-worker thread counts computed at import time.
+        os.environ["XCOMET_SUPERVISOR_PID"] = str(os.getpid())
+        uvicorn.run(
+            "server:app",
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+            workers=_workers,
+            **options,
+        )
+    else:
+        server = uvicorn.Server(uvicorn.Config(app, **options))
+
+        # Run with the pre-bound socket
+        server.run(sockets=[sock])
@@ -17,6 +17,8 @@ const HEALTH_CHECK_FAILURES_BEFORE_RESTART = 3;
 const RESTART_DELAY_MS = 2000;
 const SERVER_START_TIMEOUT = 30000;
 const DEBUG = process.env.XCOMET_DEBUG === "true";
+// XCOMET_PRELOAD values that disable eager model loading (matches python/server.py)
+const PRELOAD_OPT_OUT_VALUES = ["false", "0", "no"];
 
 /**
  * Debug logging helper
@@ -150,7 +152,7 @@ export class PythonServerManager {
       maxRetries: config.maxRetries ?? DEFAULT_MAX_RETRIES,
       healthCheckInterval: config.healthCheckInterval ?? DEFAULT_HEALTH_CHECK_INTERVAL,
       maxRestarts: config.maxRestarts ?? DEFAULT_MAX_RESTARTS,
-      preload: config.preload ?? (process.env.XCOMET_PRELOAD?.toLowerCase() === "true"),
+      preload: config.preload ?? !PRELOAD_OPT_OUT_VALUES.includes(process.env.XCOMET_PRELOAD?.toLowerCase() ?? ""),
     };
   }
 
@@ -577,6 +579,9 @@ export class PythonServerManager {
     total_pairs_evaluated: number;
     total_inference_time_ms: number;
     avg_inference_time_ms: number | null;
+    cache_hits: number;
+    cache_misses: number;
+    cache_size: number;
   }> {
     return this.request("/stats", "GET", undefined, 5000);
   }
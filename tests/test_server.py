@@ -24,6 +24,8 @@ class TestStatisticsClarity:
             "batch_api_count",
             "total_pairs_evaluated",
             "total_inference_time_ms",
+            "cache_hits",
+            "cache_misses",
         }
 
         # Import the stats from server
@@ -148,5 +150,487 @@ class TestHealthEndpoint:
         assert "model_name" in data
 
 
+class TestLengthOrdering:
+    """Tests for length-sorted batching in /batch_evaluate"""
+
+    def test_orders_by_total_length(self):
+        """Pairs are ordered by combined src + mt + ref length"""
+        from server import _length_order
+
+        data = [
+            {"src": "aaaa", "mt": "aaaa"},
+            {"src": "a", "mt": "a"},
+            {"src": "aa", "mt": "aa", "ref": "aaaaaaaa"},
+        ]
+        assert _length_order(data) == [1, 0, 2]
+
+    def test_order_is_a_permutation(self):
+        """Every original index appears exactly once"""
+        from server import _length_order
+
+        data = [{"src": "x" * (i % 5), "mt": "y"} for i in range(20)]
+        assert sorted(_length_order(data)) == list(range(20))
+
+
+class TestScoreCache:
+    """Tests for the (source, translation, reference, model) score cache"""
+
+    @pytest.fixture
+    def empty_cache(self):
+        """Clear the cache and its counters around each test"""
+        import server
+        server._score_cache.clear()
+        server._stats["cache_hits"] = 0
+        server._stats["cache_misses"] = 0
+        yield server
+        server._score_cache.clear()
+        server._stats["cache_hits"] = 0
+        server._stats["cache_misses"] = 0
+
+    def test_key_distinguishes_fields(self):
+        """Moving text between fields or changing the model changes the key"""
+        from server import _cache_key
+
+        key = _cache_key("a", "b", None, "m")
+        assert len(key) == 16
+        assert key == _cache_key("a", "b", None, "m")
+        assert key != _cache_key("ab", "", None, "m")
+        assert key != _cache_key("a", "b", "c", "m")
+        assert key != _cache_key("a", "b", None, "other")
+
+    def test_hit_and_miss_counters(self, empty_cache):
+        """Lookups update hit/miss statistics"""
+        server = empty_cache
+        key = server._cache_key("a", "b", None, "m")
+
+        assert server._cache_get(key) is None
+        server._cache_put(key, {"score": 0.5, "errors": []})
+        assert server._cache_get(key) == {"score": 0.5, "errors": []}
+
+        assert server._stats["cache_misses"] == 1
+        assert server._stats["cache_hits"] == 1
+
+    def test_evicts_least_recently_used(self, empty_cache, monkeypatch):
+        """Oldest unused entry is evicted once the cache is full"""
+        server = empty_cache
+        monkeypatch.setattr(server, "_score_cache_size", 2)
+
+        server._cache_put(b"a", {"score": 1.0, "errors": []})
+        server._cache_put(b"b", {"score": 2.0, "errors": []})
+        server._cache_get(b"a")
+        server._cache_put(b"c", {"score": 3.0, "errors": []})
+
+        assert list(server._score_cache) == [b"a", b"c"]
+
+
+class TestErrorSpanExtraction:
+    """Tests for error span extraction from model metadata"""
+
+    def test_complete_spans(self):
+        """Spans with all fields are copied as-is"""
+        from server import _extract_errors
+
+        spans = [{"text": "foo", "start": 0, "end": 3, "severity": "major", "confidence": 0.9}]
+        assert _extract_errors(spans) == [
+            {"text": "foo", "start": 0, "end": 3, "severity": "major"},
+        ]
+
+    def test_missing_fields_use_defaults(self):
+        """Missing fields fall back to defaults"""
+        from server import _extract_errors
+
+        spans = [
+            {"text": "foo", "start": 0, "end": 3, "severity": "critical"},
+            {"text": "bar"},
+        ]
+        assert _extract_errors(spans) == [
+            {"text": "foo", "start": 0, "end": 3, "severity": "critical"},
+            {"text": "bar", "start": 0, "end": 0, "severity": "minor"},
+        ]
+
+    def test_no_spans(self):
+        """Missing spans yield no errors"""
+        from server import _extract_errors
+
+        assert _extract_errors(None) == []
+        assert _extract_errors([]) == []
+
+    def test_split_comet_metadata_per_item(self):
+        """COMET metadata is a dict of per-field lists, split into one span list per item"""
+        from server import _error_spans_per_item
+
+        span = {"text": "foo", "start": 0, "end": 3, "severity": "major"}
+        metadata = {
+            "src_scores": [0.1, 0.2, 0.3],
+            "mqm_scores": [0.4, 0.5, 0.6],
+            "error_spans": [[span], [], [span]],
+        }
+        assert _error_spans_per_item(metadata, 3) == [[span], [], [span]]
+        assert _error_spans_per_item({"src_scores": [0.1]}, 2) == [None, None]
+
+    @pytest.mark.parametrize("output_metadata", [{"src_scores": [0.1, 0.2]}, None])
+    def test_unknown_span_support_tolerates_missing_metadata(self, monkeypatch, output_metadata):
+        """With span support unknown (failed warm-up probe), plain metadata yields no spans"""
+        import types
+        from contextlib import nullcontext
+        import server
+
+        class FakeModel:
+            def predict(self, data, **kwargs):
+                output = types.SimpleNamespace(scores=[0.5] * len(data))
+                if output_metadata is not None:
+                    output.metadata = output_metadata
+                return output
+
+        monkeypatch.setitem(sys.modules, "torch", types.SimpleNamespace(inference_mode=nullcontext))
+        monkeypatch.setattr(server, "get_model", lambda: FakeModel())
+        monkeypatch.setattr(server, "_model_emits_spans", True)
+
+        data = [{"src": "s", "mt": "m"}, {"src": "s", "mt": "n"}]
+        scores, spans, _ = server._predict(data, batch_size=2, gpus=0)
+        assert scores == [0.5, 0.5]
+        assert spans == [None, None]
+
+
+class _FakeTensor:
+    """Minimal 2-D tensor stand-in for the tokenizer cache tests"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def sum(self, dim):
+        return _FakeTensor([sum(row) for row in self.rows])
+
+    def __getitem__(self, index):
+        row, columns = index
+        return _FakeTensor(self.rows[row][columns])
+
+    def tolist(self):
+        return self.rows
+
+
+class TestTokenCache:
+    """Tests for caching tokenized sentences across predict calls"""
+
+    def test_second_predict_hits_the_cache(self, monkeypatch):
+        """A sentence tokenized by one predict call is reused by the next"""
+        import types
+        from contextlib import nullcontext
+        import server
+
+        tokenized = []
+
+        class FakeTokenizer:
+            padding_side = "right"
+
+            def pad(self, rows, padding, return_tensors):
+                width = max(len(row["input_ids"]) for row in rows)
+                return {
+                    name: [row[name] + [0] * (width - len(row[name])) for row in rows]
+                    for name in rows[0]
+                }
+
+        class FakeEncoder:
+            tokenizer = FakeTokenizer()
+
+            def prepare_sample(self, sample):
+                tokenized.extend(sample)
+                width = max(len(text) for text in sample)
+                return {
+                    "input_ids": _FakeTensor([[ord(c) for c in t] + [0] * (width - len(t)) for t in sample]),
+                    "attention_mask": _FakeTensor([[1] * len(t) + [0] * (width - len(t)) for t in sample]),
+                }
+
+        class FakeModel:
+            encoder = FakeEncoder()
+
+            def predict(self, data, num_workers, **kwargs):
+                assert num_workers == 0  # Collation must stay in this process
+                inputs = self.encoder.prepare_sample([d["src"] for d in data])
+                return types.SimpleNamespace(scores=[0.5] * len(inputs["input_ids"]), metadata=None)
+
+        model = FakeModel()
+        server._token_cache.clear()
+        server._install_token_cache(model)
+        monkeypatch.setitem(sys.modules, "torch", types.SimpleNamespace(inference_mode=nullcontext))
+        monkeypatch.setattr(server, "get_model", lambda: model)
+
+        try:
+            server._predict([{"src": "ab", "mt": "x"}, {"src": "c", "mt": "y"}], 2, 0)
+            server._predict([{"src": "c", "mt": "z"}, {"src": "abc", "mt": "w"}], 2, 0)
+            assert tokenized == ["ab", "c", "abc"]
+            assert model.encoder.prepare_sample(["c", "ab"]) == {
+                "input_ids": [[ord("c"), 0], [ord("a"), ord("b")]],
+                "attention_mask": [[1, 0], [1, 1]],
+            }
+        finally:
+            server._token_cache.clear()
+
+
+class TestWarmup:
+    """Tests for the load-time warm-up prediction"""
+
+    @pytest.fixture
+    def fake_torch(self, monkeypatch):
+        """Stub torch with CUDA reported as available"""
+        import types
+        from contextlib import nullcontext
+
+        monkeypatch.setitem(sys.modules, "torch", types.SimpleNamespace(
+            inference_mode=nullcontext,
+            cuda=types.SimpleNamespace(is_available=lambda: True),
+        ))
+        yield
+
+    def test_warms_up_on_cpu(self, fake_torch):
+        """Warm-up runs on CPU like default (use_gpu=false) requests, even with CUDA present"""
+        import types
+        import server
+
+        calls = []
+
+        class FakeModel:
+            def predict(self, data, gpus, **kwargs):
+                calls.append(gpus)
+                return types.SimpleNamespace(scores=[1.0], metadata={"error_spans": [[]]})
+
+        assert server._warmup(FakeModel(), "Unbabel/XCOMET-XL") is True
+        assert calls == [0]
+
+    def test_failure_does_not_block_loading(self, fake_torch):
+        """A failing warm-up is logged and span support is treated as unknown"""
+        import server
+
+        class FakeModel:
+            def predict(self, data, **kwargs):
+                raise RuntimeError("predict failed")
+
+        assert server._warmup(FakeModel(), "Unbabel/XCOMET-XL") is True
+
+
+class TestRequestCoalescing:
+    """Tests for coalescing concurrent single-pair requests"""
+
+    @pytest.mark.asyncio
+    async def test_queued_requests_share_one_predict_call(self, monkeypatch):
+        """Requests queued together are scored in a single batch"""
+        import server
+
+        calls = []
+
+        def fake_predict(data, batch_size, gpus):
+            calls.append((len(data), batch_size, gpus))
+            return [len(d["mt"]) / 10 for d in data], [None] * len(data), 5
+
+        monkeypatch.setattr(server, "_predict", fake_predict)
+        monkeypatch.setattr(server, "_batch_wait_ms", 50)
+
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        futures = [loop.create_future() for _ in range(3)]
+        for n, future in enumerate(futures, start=1):
+            queue.put_nowait(({"src": "s", "mt": "x" * n}, 0, future))
+
+        worker = asyncio.create_task(server._batch_worker(queue))
+        try:
+            results = await asyncio.gather(*futures)
+        finally:
+            worker.cancel()
+
+        assert calls == [(3, 3, 0)]
+        assert [score for score, _, _ in results] == [0.1, 0.2, 0.3]
+        # The batch's 5ms is split across the three requests
+        assert [time_ms for _, _, time_ms in results] == [2, 2, 1]
+
+
+    def test_evaluate_and_detect_errors_share_the_queue(self, monkeypatch):
+        """/evaluate and /detect_errors both score through the coalescing worker"""
+        from fastapi.testclient import TestClient
+        import server
+
+        calls = []
+
+        def fake_predict(data, batch_size, gpus):
+            calls.append(len(data))
+            spans = [{"text": "x", "start": 0, "end": 1, "severity": "major"}]
+            return [0.8] * len(data), [spans] * len(data), 1
+
+        monkeypatch.setenv("XCOMET_PRELOAD", "false")
+        monkeypatch.setattr(server, "_predict", fake_predict)
+        monkeypatch.setattr(server, "_score_cache_size", 0)
+
+        with TestClient(server.app) as client:
+            assert server._batch_queue is not None
+            evaluated = client.post("/evaluate", json={"source": "a", "translation": "b"})
+            detected = client.post(
+                "/detect_errors",
+                json={"source": "c", "translation": "d", "min_severity": "critical"},
+            )
+
+        assert calls == [1, 1]
+        assert evaluated.json()["score"] == 0.8
+        assert evaluated.json()["summary"] == "Good quality (score: 0.800) with 1 error(s) detected."
+        assert detected.json()["total_errors"] == 0
+
+
+class TestBatchEndpoints:
+    """Tests for /batch_evaluate and the NDJSON /batch_evaluate_stream endpoint"""
+
+    @pytest.fixture
+    def fake_model(self, monkeypatch):
+        """Score pairs by translation length without loading a model"""
+        import server
+
+        def fake_predict(data, batch_size, gpus):
+            return [len(d["mt"]) / 10 for d in data], [None] * len(data), 1
+
+        monkeypatch.setattr(server, "_predict", fake_predict)
+        monkeypatch.setattr(server, "_score_cache_size", 0)
+        yield
+
+    def test_batch_evaluate_with_comet_metadata(self, monkeypatch):
+        """Error spans from COMET's dict-of-lists metadata reach the right rows"""
+        import types
+        from contextlib import nullcontext
+        from fastapi.testclient import TestClient
+        import server
+
+        span = {"text": "x", "start": 0, "end": 1, "severity": "critical"}
+
+        class FakeModel:
+            def predict(self, data, **kwargs):
+                return types.SimpleNamespace(
+                    scores=[len(d["mt"]) / 10 for d in data],
+                    metadata={
+                        "src_scores": [0.5] * len(data),
+                        "mqm_scores": [0.5] * len(data),
+                        "error_spans": [[span] if len(d["mt"]) == 3 else [] for d in data],
+                    },
+                )
+
+        monkeypatch.setitem(sys.modules, "torch", types.SimpleNamespace(inference_mode=nullcontext))
+        monkeypatch.setattr(server, "get_model", FakeModel)
+        monkeypatch.setattr(server, "_model_emits_spans", True)
+        monkeypatch.setattr(server, "_score_cache_size", 0)
+
+        client = TestClient(server.app)
+        pairs = [{"source": "s", "translation": "x" * n} for n in (9, 3, 7, 5)]
+        response = client.post("/batch_evaluate", json={"pairs": pairs})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["error_count"] for r in results] == [0, 1, 0, 0]
+        assert results[1]["errors"] == [span]
+        assert results[1]["has_critical_errors"] is True
+
+    def test_batch_evaluate_statistics(self, fake_model):
+        """Average, good and critical counts cover every pair"""
+        from fastapi.testclient import TestClient
+        from server import app
+
+        client = TestClient(app)
+        pairs = [{"source": "s", "translation": "x" * n} for n in (9, 3, 7)]
+        data = client.post("/batch_evaluate", json={"pairs": pairs}).json()
+
+        assert [r["index"] for r in data["results"]] == [0, 1, 2]
+        assert data["average_score"] == pytest.approx(19 / 30)
+        assert data["summary"].endswith("2 good quality, 0 with critical errors.")
+
+    def test_invalid_batch_body_is_rejected(self, fake_model):
+        """Invalid bodies get FastAPI-style 422 errors"""
+        from fastapi.testclient import TestClient
+        from server import app
+
+        client = TestClient(app)
+        response = client.post("/batch_evaluate", json={"pairs": [{"source": "s"}]})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "pairs", 0, "translation"]
+
+        response = client.post(
+            "/batch_evaluate_stream",
+            content=b"{not json",
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == 422
+
+    def test_openapi_documents_batch_body(self):
+        """Both batch routes document BatchEvaluateRequest with resolvable refs"""
+        from fastapi.testclient import TestClient
+        from server import app
+
+        schema = TestClient(app).get("/openapi.json").json()
+        for path in ("/batch_evaluate", "/batch_evaluate_stream"):
+            body = schema["paths"][path]["post"]["requestBody"]
+            assert body["required"] is True
+            pairs = body["content"]["application/json"]["schema"]["properties"]["pairs"]
+            assert pairs["items"]["$ref"] == "#/components/schemas/TranslationPair"
+        assert "TranslationPair" in schema["components"]["schemas"]
+
+    def test_streams_header_rows_and_summary(self, fake_model):
+        """Rows are streamed in input order between a header and a summary line"""
+        from fastapi.testclient import TestClient
+        from server import app
+
+        client = TestClient(app)
+        pairs = [{"source": "s", "translation": "x" * n} for n in (9, 3, 7)]
+        response = client.post("/batch_evaluate_stream", json={"pairs": pairs, "batch_size": 1})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+
+        assert lines[0] == {"total_pairs": 3}
+        assert [row["index"] for row in lines[1:4]] == [0, 1, 2]
+        assert [row["score"] for row in lines[1:4]] == [0.9, 0.3, 0.7]
+        assert lines[4]["average_score"] == pytest.approx(19 / 30)
+        assert "2 good quality" in lines[4]["summary"]
+
+    def test_stream_ends_with_error_line_on_failure(self, monkeypatch):
+        """A scoring failure after the header ends the stream with an error line"""
+        from fastapi.testclient import TestClient
+        import server
+
+        def failing_predict(data, batch_size, gpus):
+            raise RuntimeError("inference failed")
+
+        monkeypatch.setattr(server, "_predict", failing_predict)
+        monkeypatch.setattr(server, "_score_cache_size", 0)
+
+        client = TestClient(server.app)
+        response = client.post(
+            "/batch_evaluate_stream",
+            json={"pairs": [{"source": "s", "translation": "t"}]},
+        )
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [{"total_pairs": 1}, {"error": "inference failed"}]
+
+    def test_stream_rejects_zero_batch_size(self, fake_model):
+        """batch_size < 1 is rejected before streaming starts"""
+        from fastapi.testclient import TestClient
+        from server import app
+
+        client = TestClient(app)
+        pairs = [{"source": "s", "translation": "t"}]
+        response = client.post("/batch_evaluate_stream", json={"pairs": pairs, "batch_size": 0})
+
+        assert response.status_code == 400
+        assert "batch_size" in response.json()["detail"]
+
+    def test_empty_batch(self, fake_model):
+        """An empty batch streams only the header and summary"""
+        from fastapi.testclient import TestClient
+        from server import app
+
+        client = TestClient(app)
+        response = client.post("/batch_evaluate_stream", json={"pairs": []})
+        lines = [json.loads(line) for line in response.text.splitlines()]
+
+        assert lines == [
+            {"total_pairs": 0},
+            {"average_score": 0, "summary": "No pairs to evaluate."},
+        ]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])